@@ -35,55 +35,55 @@ def create_large_dataset(size):
 
 # @line_profiler.profile
 def benchmark_dotwiz(data):
-    start = time.time()
+    start = time.perf_counter()
     dotwiz_instances = [DotWiz(item) for item in data]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 
 
 def benchmark_current(data):
-    start = time.time()
+    start = time.perf_counter()
     lined_instances = [current(item) for item in data]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 def benchmark_make_dot_wiz(data):
-    start = time.time()
+    start = time.perf_counter()
     dotwiz_instances = [make_dot_wiz(item) for item in data]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 def benchmark_original(data):
-    start = time.time()
+    start = time.perf_counter()
     original_instances = [original(item) for item in data]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 # Function to benchmark dataclasses
 def benchmark_dataclass(data):
-    start = time.time()
+    start = time.perf_counter()
     dataclass_instances = [DataClassExample(**item) for item in data]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 def benchmark_make_dataclass(data):
-    start = time.time()
+    start = time.perf_counter()
     dataclass_instances = [
         make_dataclass("DataClassExample", item.keys())(**item) for item in data
     ]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 # @line_profiler.profile
 def benchmark_access(instance_list):
-    start = time.time()
+    start = time.perf_counter()
     for instance in instance_list:
         _ = instance.key1
         if type(instance) == DataClassExample:
@@ -91,7 +91,7 @@ def benchmark_access(instance_list):
         else:
             _ = instance.key2.nested_key1.nested_key2.nested_key3.nested_key4
         _ = instance.key3[1][1]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
@@ -100,25 +100,25 @@ def benchmark_dataclass_to_dict(data):
     dataclass_instances = [
         make_dataclass("DataClassExample", item.keys())(**item) for item in data
     ]
-    start = time.time()
+    start = time.perf_counter()
     dataclass_dicts = [asdict(item) for item in dataclass_instances]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 def benchmark_original_to_dict(data):
     original_dicts = [original(d) for d in data]
-    start = time.time()
+    start = time.perf_counter()
     out_dicts = [original.to_dict(od) for od in original_dicts]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
 def benchmark_dotwiz_to_dict(data):
     dotwiz_dicts = [DotWiz(d) for d in data]
-    start = time.time()
+    start = time.perf_counter()
     out_dicts = [DotWiz.to_dict(dw) for dw in dotwiz_dicts]
-    end = time.time()
+    end = time.perf_counter()
     return end - start
 
 
@@ -129,9 +129,7 @@ dataset_size = 10000  # Adjust size as needed
 data = create_large_dataset(dataset_size)
 
 
-import cProfile
-import pstats
-from io import StringIO
+from pyinstrument import Profiler
 
 
 # Function to run the benchmark
@@ -177,18 +175,14 @@ def run_benchmark():
     # print(f"Dataclass to dict: {dataclass_to_dict_time:.4f} seconds")
 
 
-# Profile the benchmark
-pr = cProfile.Profile()
-pr.enable()
+# Profile the benchmark with pyinstrument, which has much lower per-call overhead than cProfile
+profiler = Profiler()
+profiler.start()
 run_benchmark()
-pr.disable()
+profiler.stop()
 
 # Print profiling results
-sortby = "cumulative"
-s = StringIO()
-ps = pstats.Stats(pr, stream=s).sort_stats(sortby)
-ps.print_stats()
-print(s.getvalue())
+print(profiler.output_text(unicode=True, color=False))
 # dw = DotWiz(data[0])
 # print(dw)
 # data = create_large_dataset(1)
@@ -1,19 +1,22 @@
 """DotWiz - forked from https://github.com/rnag/dotwiz."""
 
 import json
-import sys
 from _collections_abc import dict_items
-from typing import IO, Any, Generator, Optional
+from typing import IO, Any, Iterator, Optional
 
-__PY_VERSION__ = sys.version_info[:2]
-__PY_38_OR_ABOVE__ = __PY_VERSION__ >= (3, 8)
-__PY_39_OR_ABOVE__ = __PY_VERSION__ >= (3, 9)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Attribute names that are set on the instance itself rather than stored as keys.
+_SENTINELS = frozenset({"__dict__", "preprocess"})
 
 
 class DotWizEncoder(json.JSONEncoder):
     """Custom JSONEncoder subclass for `DotWiz` objects."""
 
-    def default(self, o):
+    def default(self, o, __default=json.JSONEncoder.default):
         """Return the `__dict__` of a `DotWiz` instance or fall back to default JSONEncoder.
 
         Args:
@@ -21,10 +24,38 @@ class DotWizEncoder(json.JSONEncoder):
             o (`DotWiz`): The `DotWiz` instance to serialize.
 
         """
-        try:
+        if isinstance(o, DotWiz):
             return o.__dict__
-        except AttributeError:
-            return json.JSONEncoder.default(self, o)
+        return __default(self, o)
+
+
+def _orjson_default(o):
+    """Return the `__dict__` of a `DotWiz` instance for `orjson`, which has no encoder class."""
+    if isinstance(o, DotWiz):
+        return o.__dict__
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any, cls: Optional[type] = None, use_orjson: bool = False, **kwargs) -> str:
+    """Serialize `obj` to a JSON string.
+
+    Uses `json.dumps` by default. With `use_orjson`, `orjson` is used instead when it is installed
+    and no json encoder options are given; anything `orjson` refuses to encode (e.g. integers
+    beyond 64 bits) falls back to `json.dumps`.
+    """
+    if use_orjson and orjson is not None and not kwargs:
+        try:
+            return orjson.dumps(
+                obj,
+                default=_orjson_default,
+                # Hand datetimes and dataclasses to `default` so they are rejected, as with `json`.
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, cls=cls, **kwargs)
 
 
 def make_dot_wiz(*args, **kwargs):
@@ -33,20 +64,28 @@ def make_dot_wiz(*args, **kwargs):
     return DotWiz(kwargs)
 
 
+def _resolve_list(value, preprocess=True):
+    """Resolve the elements of a list, converting only nested dicts and lists."""
+    return [
+        _resolve_value(e, preprocess) if type(e) in _RESOLVERS or isinstance(e, (dict, list)) else e
+        for e in value
+    ]
+
+
 def _resolve_value(value, preprocess=True):
     """Resolve value while iterating over a data structure during conversion processes."""
-    if not preprocess or not isinstance(
-        value, (list, dict)
-    ):  # 3.0 for original, 6.9 total for both, this is 4.8
+    resolver = _RESOLVERS.get(type(value))
+    if resolver is None:
+        # Subclasses such as `OrderedDict` or `defaultdict` miss the exact-type table.
+        if isinstance(value, dict):
+            resolver = DotWiz
+        elif isinstance(value, list):
+            resolver = _resolve_list
+        else:
+            return value
+    if not preprocess:
         return value
-    try:
-        if preprocess and "append" in value.__class__.__dict__:
-            return [_resolve_value(e, preprocess) for e in value]
-        if "fromkeys" in value.__class__.__dict__:
-            return DotWiz(value, preprocess)
-    except AttributeError:
-        pass
-    return value
+    return resolver(value, preprocess)
 
 
 def _upsert_into_dot_wiz(
@@ -55,85 +94,64 @@ def _upsert_into_dot_wiz(
     preprocess: Optional[bool] = False,
     **kwargs,
 ) -> "DotWiz":
-    """Create or update a `DotWiz` from a dict and optional keyword arguments.
+    """Initialize a `DotWiz` from a dict and optional keyword arguments.
 
     Args:
     ----
         self (`DotWiz`): DotWiz instance.
         input_dict (Optional[dict]): Input dict.
-        preprocess (Optional[bool]): Whether to convert internal dictionary objects at instantion or
-        not.
+        preprocess (Optional[bool]): Whether to also convert dictionary objects nested in lists at
+        instantiation or not. Nested dictionary values are always converted.
         kwargs: Optional keyword arguments.
 
     """
-    if not kwargs and not input_dict:
+    if kwargs:
+        # Apply each source in turn, so later keyword arguments still override input keys.
+        _upsert_into_dot_wiz(self, input_dict, preprocess)
+        _upsert_into_dot_wiz(self, kwargs, preprocess)
         return
-
-    combined_dict = {**input_dict, **kwargs} if input_dict else kwargs
-    if not preprocess:
-        self.__dict__.update(combined_dict)
+    if not input_dict:
         return
 
-    for key in combined_dict:
-        if "fromkeys" in combined_dict[key].__class__.__dict__:
-            self.__dict__[key] = DotWiz(
-                combined_dict[key], preprocess
-            )
-            continue
-        if "append" in combined_dict[key].__class__.__dict__:
-            self.__dict__[key] = [_resolve_value(e) for e in combined_dict[key]]
-            continue
-        self.__dict__[key] = combined_dict[key]
-
-
-if __PY_38_OR_ABOVE__:
-
-    def _reversed_impl(self):
-        """Implement `__reversed__`, to reverse the keys in a `DotWiz` instance."""
-        return reversed(self.__dict__)
-else:
-
-    def _reversed_impl(self):
-        """Implement `__reversed__`, to reverse the keys in a `DotWiz` instance."""
-        return reversed(list(self.__dict__))
-
-
-if __PY_39_OR_ABOVE__:
-
-    def _merge_impl_fn(op, check_lists=True):
-        """Implement `__or__` and `__ror__`, to merge `DotWiz` and dict objects."""
-
-        def _merge_impl(self, other):
-            __other_dict = getattr(other, "__dict__", None) or {
-                k: _resolve_value(other[k], check_lists) for k in other
-            }
-            __merged_dict = op(self.__dict__, __other_dict)
-
-            return DotWiz(__merged_dict, _check_types=False)
-
-        return _merge_impl
-
-    _or_impl = _merge_impl_fn(dict.__or__)
-    _ror_impl = _merge_impl_fn(dict.__ror__)
+    # Copy everything in one pre-sized update, then overwrite only the values that need
+    # converting; replacing an existing key never resizes the table.
+    __dict = self.__dict__
+    __dict.update(input_dict)
+    for key, value in input_dict.items():
+        value_type = type(value)
+        if value_type is dict:
+            __dict[key] = DotWiz(value, preprocess)
+        elif value_type is list:
+            if preprocess:
+                __dict[key] = _resolve_list(value)
+        elif isinstance(value, dict):
+            __dict[key] = DotWiz(value, preprocess)
+        elif preprocess and isinstance(value, list):
+            __dict[key] = _resolve_list(value)
+
+
+def _merge_impl_fn(op, check_lists=True):
+    """Implement `__or__` and `__ror__`, to merge `DotWiz` and dict objects."""
+
+    def _merge_impl(self, other):
+        __other_dict = other.__dict__ if isinstance(other, DotWiz) else {
+            k: _resolve_value(v, check_lists) for k, v in other.items()
+        }
+        __merged_dict = op(self.__dict__, __other_dict)
 
-else:
+        return DotWiz._from_dict(__merged_dict)
 
-    def _or_impl(self, other, check_lists=True):
-        """Implement `__or__` to merge `DotWiz` and dict objects."""
-        __other_dict = getattr(other, "__dict__", None) or {
-            k: _resolve_value(other[k], check_lists) for k in other
-        }
-        __merged_dict = {**self.__dict__, **__other_dict}
+    return _merge_impl
 
-        return DotWiz(__merged_dict, _check_types=False)
 
-    _ror_impl = _or_impl
+_or_impl = _merge_impl_fn(dict.__or__)
+_ror_impl = _merge_impl_fn(dict.__ror__)
 
 
 def _ior_impl(self, other, check_lists=True, __update=dict.update):
     """Implement `__ior__` to incrementally update a `DotWiz` instance."""
-    __other_dict = getattr(other, "__dict__", None) or {
-        k: _resolve_value(other[k], DotWiz, check_lists) for k in other
+    __other_dict = other.__dict__ if isinstance(other, DotWiz) else {
+        k: _resolve_value(v, check_lists) for k, v in other.items()
     }
     __update(self.__dict__, __other_dict)
 
@@ -161,7 +179,7 @@ class DotWiz:
 
     __slots__ = ("__dict__",)
 
-    __init__ = update = _upsert_into_dot_wiz
+    __init__ = _upsert_into_dot_wiz
 
     #print_char = "☣"
 
@@ -171,12 +189,7 @@ class DotWiz:
 
     def __contains__(self, item) -> bool:
         """Implement `__contains__`."""
-        try:
-            return item, getattr(self, item)
-        except AttributeError:
-            return False
-        except TypeError:
-            return item in self.__dict__
+        return item in self.__dict__
 
     def __eq__(self, other) -> bool:
         """Implement = operator."""
@@ -188,7 +201,7 @@ class DotWiz:
 
     def _setitem_impl(self, key: Any, value: Any, preprocess: bool = True) -> None:
         """Implement `DotWiz.__setitem__` to preserve dot access."""
-        if key in ("__dict__", "preprocess"):
+        if key in _SENTINELS:
             super().__setattr__(key, value)
         else:
             self.__dict__[key] = _resolve_value(value, preprocess)
@@ -200,52 +213,23 @@ class DotWiz:
 
     def __delitem__(self, key) -> None:
         """Implement `__delitem__` with performance enhancement."""
-        try:
-            delattr(self, key)
-        except TypeError:
-            del self.__dict__[key]
+        del self.__dict__[key]
 
-    def __getitem__(self, key, __default=None) -> Any:
+    def __getitem__(self, key, __default=None, __get=dict.get) -> Any:
         """Implement `__getitem__` with default dict behavior."""
-        try:
-            return self.get(key)
-        except TypeError:
-            return self.__dict__[key]
+        return __get(self.__dict__, key, __default)
 
     def __getattr__(self, item: str, __default=None) -> Any:
-        """Implement `__getattr__` with default dict behavior."""
-        if item in self.__dict__:
-            value = self.__dict__[item]
-            if isinstance(value, dict) and not self.preprocess:
-                value = DotWiz(value)
-                self.__dict__[item] = value
-            return value
-        self.__dict__[item] = __default
-        return __default
+        """Implement `__getattr__` with default dict behavior.
 
-    def __getattribute__(self, name):
-        """Override getattribute to implement preprocessing logic."""
-        if name in (
-            "preprocess",
-            "__dict__",
-            "__class__",
-            "__slots__",
-            "_upsert_into_dot_wiz",
-            "_resolve_value",
-        ):
-            return super().__getattribute__(name)
-        try:
-            value = super().__getattribute__("__dict__")[name]
-            if isinstance(value, dict) and not super().__getattribute__("preprocess"):
-                value = DotWiz(value)
-                super().__getattribute__("__dict__")[name] = value
-            return value
-        except KeyError:
-            return super().__getattribute__(name)
+        Only called when normal attribute lookup misses, so keys present in `__dict__` never
+        reach this method. The missing key is not inserted, so reads never write to `__dict__`.
+        """
+        return __default
 
     __setattr__ = __setitem__ = _setitem_impl
 
-    def __iter__(self) -> Generator:
+    def __iter__(self) -> Iterator:
         """Implement `__iter__`."""
         return iter(self.__dict__.items())
 
@@ -255,27 +239,39 @@ class DotWiz:
 
     def __repr__(self) -> str:
         """Implement `__repr__`."""
-        return f'({", ".join(f"{k}={v!r}" for k, v in self)})'
+        return f'({", ".join([f"{k}={v!r}" for k, v in self.__dict__.items()])})'
 
     __or__ = _or_impl
     __ior__ = _ior_impl
     __ror__ = _ror_impl
 
-    __reversed__ = _reversed_impl
+    def __reversed__(self):
+        """Implement `__reversed__`, to reverse the keys in a `DotWiz` instance."""
+        return reversed(self.__dict__)
 
     def clear(self) -> None:
         """Implement `__clear__`."""
         return self.__dict__.clear()
 
-    def copy(self, __copy=dict.copy) -> "DotWiz":
-        """Implement `copy`."""
-        return DotWiz(__copy(self.__dict__), _check_types=False)
+    def copy(self) -> "DotWiz":
+        """Implement `copy` as a shallow copy that skips `__init__`."""
+        return DotWiz._from_dict(self.__dict__)
 
     @classmethod
     def fromkeys(cls, seq, value=None, __from_keys=dict.fromkeys) -> "DotWiz":
         """Implement `fromkeys`."""
         return cls(__from_keys(seq, value))
 
+    @classmethod
+    def _from_dict(cls, d: dict, __new=object.__new__) -> "DotWiz":
+        """Create a `DotWiz` from a dict whose values are already resolved, skipping `__init__`.
+
+        The dict is copied in a single `dict.update` call; nested dicts are not converted.
+        """
+        self = __new(cls)
+        self.__dict__.update(d)
+        return self
+
     def get(self, k, default=None, __get=dict.get) -> Any:
         """Implement `get`."""
         return __get(self.__dict__, k, default)
@@ -298,18 +294,23 @@ class DotWiz:
 
     def setdefault(self, k, default=None, check_lists=True, __get=dict.get) -> Any:
         """Implement `setdefault`."""
-        result = __get(self.__dict__, k)
+        __dict = self.__dict__
+        result = __get(__dict, k)
 
         if result is not None:
             return result
 
-        self.__dict__[k] = default = _resolve_value(k, check_lists)
+        __dict[k] = default = _resolve_value(default, check_lists)
 
         return default
-    def __iter__(self):
-        keys = [attr for attr in self.__dict__.keys() if not attr.startswith('_')]
-        yield from [self.__dict__[key] for key in keys]
-    
+
+    def update(self, other=None, **kwargs) -> None:
+        """Implement `update`, resolving values the same way `__setitem__` and `|=` do."""
+        if other:
+            _ior_impl(self, other)
+        if kwargs:
+            _ior_impl(self, kwargs)
+
     def values(self) -> list:
         """Implement `values`."""
         return self.__dict__.values()
@@ -334,15 +335,20 @@ class DotWiz:
 
         """
 
-        def __object_hook(d) -> "DotWiz":
+        def __object_hook(d, __new=object.__new__, __set=object.__setattr__) -> "DotWiz":
             """De-serialize `DotWiz` instances.
 
+            The decoder creates `d` and never references it again, so it is adopted as the
+            instance `__dict__` without copying.
+
             Args:
             ----
                 d (dict): A JSON object to de-serialize.
 
             """
-            return cls(d, _check_types=False)
+            self = __new(cls)
+            __set(self, "__dict__", d)
+            return self
 
         if not jsons and not file:
             raise ValueError("Either a JSON string or a file must be provided.")
@@ -365,8 +371,9 @@ class DotWiz:
     def to_dict(o: "DotWiz", keep_snakes: bool = True) -> dict:
         """Convert a `DotWiz` instance to a python dict, optionally stripping underscores.
 
-        Recursively traverses all dict, list, set or tuple instances assigned to attributes to
-        convert any nested `DotWiz` instances.
+        Traverses all dict, list, set or tuple instances assigned to attributes to convert any
+        nested `DotWiz` instances. The walk uses an explicit stack rather than recursion, and only
+        container values are pushed onto it; scalars are copied into place directly.
 
         Args:
         ----
@@ -378,19 +385,62 @@ class DotWiz:
             dict: The converted `DotWiz` instance.
 
         """
-        if not hasattr(o, "__iter__") or hasattr(o, "strip"):
+        containers = _TO_DICT_DISPATCH
+        if type(o) not in containers and not isinstance(o, DotWiz):
             return o
-        elif all((hasattr(o, "fromkeys"), hasattr(o, "from_json"))):
-            return {
-                k if keep_snakes else k.strip("_"): DotWiz.to_dict(v, keep_snakes) for k, v in o
-            }
-        return type(o)(DotWiz.to_dict(e, keep_snakes) for e in o)
+
+        root = [o]
+        stack = [(o, root, 0)]
+        push, pop = stack.append, stack.pop
+        # Tuples and sets are built as lists first and frozen once their children are done.
+        frozen = []
+        # `id()`s of the containers between the root and the current node, to detect cycles.
+        path = set()
+
+        while stack:
+            src, dst, key = pop()
+            if dst is None:
+                # Exit marker, popped once all children of the container `key` are done.
+                path.remove(key)
+                continue
+            if dst[key] is not src:
+                # A later key stripped to the same name and replaced this value.
+                continue
+            node_id = id(src)
+            if node_id in path:
+                raise ValueError("Circular reference detected")
+            path.add(node_id)
+            push((None, None, node_id))
+
+            src_type = type(src)
+            # Types missing from the table are `DotWiz` subclasses, which convert like `DotWiz`.
+            if containers.get(src_type, True):
+                dst[key] = out = {}
+                for k, v in (src if src_type is dict else src.__dict__).items():
+                    if not keep_snakes:
+                        k = k.strip("_")
+                    out[k] = v
+                    if type(v) in containers or isinstance(v, DotWiz):
+                        push((v, out, k))
+            else:
+                dst[key] = out = list(src)
+                if src_type is not list:
+                    frozen.append((dst, key, src_type))
+                for i, v in enumerate(out):
+                    if type(v) in containers or isinstance(v, DotWiz):
+                        push((v, out, i))
+
+        for dst, key, src_type in reversed(frozen):
+            dst[key] = src_type(dst[key])
+
+        return root[0]
 
     @staticmethod
     def to_json(
         o: "DotWiz",
         file: Optional[str] = None,
         keep_snakes: Optional[bool] = True,
+        use_orjson: bool = False,
         **kwargs,
     ):
         """Serialize a DotWiz to a JSON string or a JSON file, optionally stripping underscores.
@@ -401,17 +451,30 @@ class DotWiz:
             file (Optional[str]): If provided, will save to a file.
             keep_snakes (bool): If `False`, will strip leading and trailing
                 underscores from keys.  Defaults to `True`.
+            use_orjson (bool): If `True` and `orjson` is installed, serialize with `orjson`
+                instead of the standard library encoder. Its output differs: separators are
+                compact, NaN and infinity become `null`, non-ASCII text is not escaped, and
+                `UUID` values are encoded as strings rather than rejected. Ignored when `kwargs`
+                are given. Defaults to `False`.
             kwargs: Optional keyword arguments passed to json encoder.
 
         """
-        cls = DotWizEncoder if keep_snakes else None
-        __initial_dict = (
-            {k.strip("_"): DotWiz.to_dict(v, False) for k, v in o.__dict__.items()},
-            o.__dict___,
-        )[keep_snakes]
+        if keep_snakes:
+            cls = DotWizEncoder
+            __initial_dict = o.__dict__
+        else:
+            cls = None
+            __initial_dict = DotWiz.to_dict(o, False)
 
         if file:
             with open(file, "w", encoding="utf-8", errors="strict") as f:
-                json.dump(__initial_dict, f, cls=cls, **kwargs)
+                f.write(_dumps(__initial_dict, cls, use_orjson, **kwargs))
             return
-        return json.dumps(__initial_dict, cls=cls)
+        return _dumps(__initial_dict, cls, use_orjson, **kwargs)
+
+
+# Container types `DotWiz.to_dict` descends into, mapped to whether they convert to a dict.
+_TO_DICT_DISPATCH = {DotWiz: True, dict: True, list: False, tuple: False, set: False}
+
+# Types `_resolve_value` converts, mapped to the callable that converts them.
+_RESOLVERS = {dict: DotWiz, list: _resolve_list}